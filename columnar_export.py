@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Illuvium Columnar Exporter
+Writes builds, per-illuvial rows and round data as Parquet datasets partitioned
+by mode and match date, so history can be scanned without loading the JSON
+"""
+
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Export is optional; the JSON output doesn't need it
+    pa = None
+    pq = None
+
+EXPORT_DIR = "exports"
+
+def _dict_string():
+    return pa.dictionary(pa.int32(), pa.string())
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    """Schemas per table; repeated strings are dictionary-encoded"""
+    return {
+        "builds": pa.schema([
+            ("game_id", pa.string()),
+            ("player_name", _dict_string()),
+            ("player_rank", pa.int32()),
+            ("placement", pa.int32()),
+            ("suit", _dict_string()),
+            ("weapon", _dict_string()),
+            ("match_date", pa.string()),
+            ("illuvial_count", pa.int32()),
+            ("bonded_count", pa.int32()),
+            ("illuvials", pa.list_(_dict_string())),
+            ("mode", pa.string()),
+            ("date", pa.string()),
+        ]),
+        "illuvials": pa.schema([
+            ("game_id", pa.string()),
+            ("player_name", _dict_string()),
+            ("slot", pa.int32()),
+            ("name", _dict_string()),
+            ("is_bonded", pa.bool_()),
+            ("augments", pa.list_(_dict_string())),
+            ("mode", pa.string()),
+            ("date", pa.string()),
+        ]),
+        "rounds": pa.schema([
+            ("game_id", pa.string()),
+            ("player_name", _dict_string()),
+            ("round_number", pa.int32()),
+            ("side", _dict_string()),
+            ("opponent", _dict_string()),
+            ("suit", _dict_string()),
+            ("weapon", _dict_string()),
+            ("illuvial_count", pa.int32()),
+            ("illuvials", pa.list_(_dict_string())),
+            ("mode", pa.string()),
+            ("date", pa.string()),
+        ]),
+    }
+
+def _partition_date(value: Optional[str]) -> str:
+    """Reduce an ISO timestamp or the fetcher's 'YYYY-MM-DD HH:MM UTC' format to a date"""
+    if not value:
+        return "unknown"
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    match = re.match(r'\d{4}-\d{2}-\d{2}', value)
+    return match.group(0) if match else "unknown"
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', name) or "player"
+
+def _illuvial_names(side: Dict[str, Any]) -> List[str]:
+    return [
+        ill.get('name', 'Unknown')
+        for ill in side.get('illuvials', []) or []
+        if isinstance(ill, dict)
+    ]
+
+def build_rows(builds) -> Dict[str, List[Dict[str, Any]]]:
+    """Flatten WinningBuild objects into build and per-illuvial rows"""
+    rows = {"builds": [], "illuvials": []}
+    for build in builds:
+        mode = build.mode or "unknown"
+        date = _partition_date(build.match_date)
+        rows["builds"].append({
+            "game_id": build.game_id,
+            "player_name": build.player_name,
+            "player_rank": build.player_rank,
+            "placement": build.placement,
+            "suit": build.suit,
+            "weapon": build.weapon,
+            "match_date": build.match_date,
+            "illuvial_count": len(build.illuvials),
+            "bonded_count": sum(1 for ill in build.illuvials if ill.is_bonded),
+            "illuvials": [ill.name for ill in build.illuvials],
+            "mode": mode,
+            "date": date,
+        })
+        for slot, ill in enumerate(build.illuvials):
+            rows["illuvials"].append({
+                "game_id": build.game_id,
+                "player_name": build.player_name,
+                "slot": slot,
+                "name": ill.name,
+                "is_bonded": bool(ill.is_bonded),
+                "augments": list(ill.augments or []),
+                "mode": mode,
+                "date": date,
+            })
+    return rows
+
+def round_rows(games: List[Dict[str, Any]], player_name: str) -> List[Dict[str, Any]]:
+    """One row per round the player fought in, taken from the raw search games"""
+    rows = []
+    for game in games:
+        if not isinstance(game, dict):
+            continue
+        game_id = game.get('gameId', game.get('id', ''))
+        mode = game.get('mode') or "unknown"
+        date = _partition_date(game.get('startTime'))
+        for index, round_data in enumerate(game.get('rounds', []) or []):
+            if not isinstance(round_data, dict):
+                continue
+            for matchup in round_data.get('matchups', []) or []:
+                if not isinstance(matchup, dict):
+                    continue
+                blue = matchup.get('blue') or {}
+                red = matchup.get('red') or {}
+                if blue.get('player') == player_name:
+                    side, mine, theirs = "blue", blue, red
+                elif red.get('player') == player_name:
+                    side, mine, theirs = "red", red, blue
+                else:
+                    continue
+                names = _illuvial_names(mine)
+                rows.append({
+                    "game_id": game_id,
+                    "player_name": player_name,
+                    "round_number": index + 1,
+                    "side": side,
+                    "opponent": theirs.get('player'),
+                    "suit": mine.get('suit'),
+                    "weapon": mine.get('weapon'),
+                    "illuvial_count": len(names),
+                    "illuvials": names,
+                    "mode": mode,
+                    "date": date,
+                })
+                break
+    return rows
+
+def _write_partition(path: str, rows: List[Dict[str, Any]], schema):
+    """Merge rows into a partition file, replacing any existing rows for the same games"""
+    # An empty game_id (missing gameId/id) is not a key; it must not wipe other id-less rows
+    new_games = {row["game_id"] for row in rows if row["game_id"]}
+    merged = []
+    if os.path.exists(path):
+        # The fetch window rarely covers a whole day, so keep games this run didn't see
+        merged = [
+            row for row in pq.read_table(path).to_pylist()
+            if not row["game_id"] or row["game_id"] not in new_games
+        ]
+    merged.extend(rows)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed so dataset discovery ignores a leftover temp file
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    pq.write_table(pa.Table.from_pylist(merged, schema=schema), temp_path)
+    os.replace(temp_path, path)
+
+def _write_table(name: str, rows: List[Dict[str, Any]], schema, output_dir: str, player_name: str):
+    """Write rows as hive-style mode=/date= partitions, one file per player per partition"""
+    partitions = defaultdict(list)
+    for row in rows:
+        row = dict(row)
+        key = (row.pop("mode"), row.pop("date"))
+        partitions[key].append(row)
+
+    # Partition values live in the directory names, not in the files
+    file_schema = pa.schema([field for field in schema if field.name not in ("mode", "date")])
+    for (mode, date), partition_rows in partitions.items():
+        path = os.path.join(
+            output_dir, name, f"mode={quote(mode, safe='')}", f"date={quote(date, safe='')}",
+            f"{_slug(player_name)}.parquet"
+        )
+        _write_partition(path, partition_rows, file_schema)
+
+def export_columnar(builds, games_by_player: Dict[str, List[Dict[str, Any]]],
+                    output_dir: str = EXPORT_DIR) -> Dict[str, int]:
+    """Write builds, illuvials and rounds datasets; returns row counts per table"""
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed (pip install pyarrow)")
+
+    schemas = _schemas()
+    counts = {name: 0 for name in schemas}
+    players = set(games_by_player) | {build.player_name for build in builds}
+    for player_name in sorted(players):
+        tables = build_rows([b for b in builds if b.player_name == player_name])
+        tables["rounds"] = round_rows(games_by_player.get(player_name, []), player_name)
+        for name, rows in tables.items():
+            if not rows:
+                continue
+            _write_table(name, rows, schemas[name], output_dir, player_name)
+            counts[name] += len(rows)
+    return counts
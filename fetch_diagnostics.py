@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Illuvium Fetch Diagnostics
+Profiling run mode for the data fetcher: per-game timing and allocations,
+a quarantine of games that failed to parse, and a slowest/largest summary
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+DIAGNOSTICS_DIR = "diagnostics"
+
+# Outcomes that are expected for healthy data; everything else is quarantined
+NORMAL_OUTCOMES = {"build", "not_a_win"}
+
+class RunDiagnostics:
+    """Collects stats for one fetcher run and writes them to output_dir on finish()"""
+
+    def __init__(self, output_dir: str = DIAGNOSTICS_DIR, trace_memory: bool = False,
+                 cprofile: bool = False, top_n: int = 10):
+        self.output_dir = output_dir
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.profiler = cProfile.Profile() if cprofile else None
+        self.stages: Counter = Counter()
+        # Time spent in our own per-game bookkeeping, excluded from stage totals
+        self.overhead_seconds = 0.0
+        self.games: List[Dict[str, Any]] = []
+        self.quarantined = 0
+        self._game_started = 0.0
+        self._game_memory = 0
+        self._game_error: Optional[BaseException] = None
+        self._started_tracemalloc = False
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.quarantine_path = os.path.join(output_dir, "quarantine.jsonl")
+        # Start each run with a fresh quarantine
+        open(self.quarantine_path, 'w', encoding='utf-8').close()
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.profiler:
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Accumulate wall time for a named stage (fetch, search, extract...)"""
+        started = time.perf_counter()
+        overhead = self.overhead_seconds
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] += elapsed - (self.overhead_seconds - overhead)
+
+    def begin_game(self):
+        self._game_error = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._game_memory = tracemalloc.get_traced_memory()[0]
+        self._game_started = time.perf_counter()
+
+    def record_error(self, error: BaseException):
+        self._game_error = error
+
+    def end_game(self, game: Any, player_name: str, outcome: str):
+        # Read memory before anything else so our own bookkeeping (e.g. sizing the payload) isn't counted
+        memory = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        ended = time.perf_counter()
+        seconds = ended - self._game_started
+        record = {
+            "player": player_name,
+            "game_id": game.get('gameId', game.get('id', '')) if isinstance(game, dict) else "",
+            "outcome": outcome,
+            "seconds": round(seconds, 6),
+            "payload_bytes": len(json.dumps(game, default=str)),
+        }
+        if memory:
+            current, peak = memory
+            record["allocated_bytes"] = current - self._game_memory
+            record["peak_bytes"] = peak - self._game_memory
+        self.games.append(record)
+
+        if outcome not in NORMAL_OUTCOMES:
+            self._quarantine(game, record)
+        # Serializing big payloads is slow; keep it out of the caller's stage timings
+        self.overhead_seconds += time.perf_counter() - ended
+
+    def _quarantine(self, game: Any, record: Dict[str, Any]):
+        entry = {"player": record["player"], "game_id": record["game_id"], "reason": record["outcome"]}
+        if self._game_error is not None:
+            entry["error_type"] = type(self._game_error).__name__
+            entry["error"] = str(self._game_error)
+            entry["traceback"] = traceback.format_exception(
+                type(self._game_error), self._game_error, self._game_error.__traceback__
+            )
+        entry["game"] = game
+        with open(self.quarantine_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+        self.quarantined += 1
+
+    def summary(self) -> Dict[str, Any]:
+        def top(key: str) -> List[Dict[str, Any]]:
+            ranked = [g for g in self.games if key in g]
+            return sorted(ranked, key=lambda g: g[key], reverse=True)[:self.top_n]
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "games": len(self.games),
+            "outcomes": dict(Counter(g["outcome"] for g in self.games)),
+            "quarantined": self.quarantined,
+            "profilers": {"cprofile": self.profiler is not None, "tracemalloc": tracemalloc.is_tracing()},
+            # Per-game and stage timings include the overhead of any enabled profilers
+            "timings_include_profiler_overhead": self.profiler is not None or tracemalloc.is_tracing(),
+            # Excluded from stage_seconds (payload sizing and quarantine writes)
+            "diagnostics_overhead_seconds": round(self.overhead_seconds, 4),
+            "stage_seconds": {name: round(s, 4) for name, s in self.stages.items()},
+            "slowest_games": top("seconds"),
+            "largest_games": top("payload_bytes"),
+            "most_allocating_games": top("peak_bytes"),
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop profilers and write summary.json (plus profile/memory reports)"""
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(os.path.join(self.output_dir, "profile.prof"))
+            text = io.StringIO()
+            pstats.Stats(self.profiler, stream=text).sort_stats("cumulative").print_stats(30)
+            with open(os.path.join(self.output_dir, "profile.txt"), 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+
+        summary = self.summary()
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            summary["top_allocations"] = [str(stat) for stat in snapshot.statistics("lineno")[:self.top_n]]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        with open(os.path.join(self.output_dir, "summary.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
@@ -11,6 +11,14 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 import time
+from contextlib import nullcontext
+
+from meta_trends import MetaTrendTracker
+from columnar_export import export_columnar, EXPORT_DIR
+from fetch_diagnostics import RunDiagnostics, DIAGNOSTICS_DIR
+
+TRENDS_STATE_FILE = "meta_trends_state.json"
+TRENDS_OUTPUT_FILE = "meta_trends.json"
 
 # Load API token from .env file
 def load_api_token():
@@ -128,26 +136,38 @@ def search_player_matches(player_name: str, days_back: int = 7) -> List[Dict[str
         print(f"❌ Error searching matches for {player_name}: {e}")
         return []
 
-def extract_builds_from_matches(matches: List[Dict[str, Any]], player_name: str, player_rank: int) -> List[WinningBuild]:
-    """Extract winning builds from matches"""
+def extract_builds_from_matches(matches: List[Dict[str, Any]], player_name: str, player_rank: int,
+                                diagnostics: Optional[RunDiagnostics] = None) -> List[WinningBuild]:
+    """Extract winning builds from matches, recording per-game outcomes if diagnostics is given"""
     builds = []
     
     for game in matches:  # API returns 'games' not 'matches'
+        # Per-game outcome; anything but "build" or "not_a_win" is quarantined in diagnostics mode
+        outcome = "build"
+        if diagnostics:
+            diagnostics.begin_game()
         try:
             # Check if player won (rank = 1 in results)
             results = game.get('results', [])
             player_result = next((r for r in results if r.get('player') == player_name), None)
             
             if not player_result:
+                outcome = "player_not_in_results"
+                continue
+            
+            if 'rank' not in player_result:
+                outcome = "missing_rank"
                 continue
                 
             placement = player_result.get('rank', 0)
             if placement != 1:  # Only winning builds
+                outcome = "not_a_win"
                 continue
             
             # Extract build data from the last round
             rounds = game.get('rounds', [])
             if not rounds:
+                outcome = "no_rounds"
                 continue
                 
             last_round = rounds[-1]  # Get the final round
@@ -168,6 +188,7 @@ def extract_builds_from_matches(matches: List[Dict[str, Any]], player_name: str,
                     break
             
             if not player_matchup:
+                outcome = "player_not_in_final_round"
                 continue
             
             # Extract Illuvials and their augments from the last round
@@ -206,6 +227,11 @@ def extract_builds_from_matches(matches: List[Dict[str, Any]], player_name: str,
                     augments=illuvial_augments
                 ))
             
+            # A winning build with no illuvials means the team schema didn't parse; the build is
+            # still emitted as before, but diagnostics mode quarantines the game
+            if not illuvials:
+                outcome = "no_valid_illuvials" if player_illuvials else "empty_team"
+            
             suit = player_matchup.get('suit', 'Unknown')
             weapon = player_matchup.get('weapon', 'Unknown')
             
@@ -242,14 +268,21 @@ def extract_builds_from_matches(matches: List[Dict[str, Any]], player_name: str,
             
         except Exception as e:
             print(f"❌ Error extracting build from game: {e}")
+            outcome = "exception"
+            if diagnostics:
+                diagnostics.record_error(e)
             continue
+        finally:
+            if diagnostics:
+                diagnostics.end_game(game, player_name, outcome)
     
     return builds
 
 
 
-def main():
-    """Function to fetch and process data"""
+def main(profile: bool = False, cprofile: bool = False, trace_memory: bool = False):
+    """Function to fetch and process data; profile=True enables the diagnostics run mode,
+    cprofile/trace_memory additionally run cProfile/tracemalloc (which inflate per-game timings)"""
     import logging
     
     # Set up logging for automation
@@ -265,22 +298,34 @@ def main():
     logger = logging.getLogger(__name__)
     logger.info("🚀 Starting Illuvium data fetcher...")
     
+    profile = profile or cprofile or trace_memory
+    diagnostics = RunDiagnostics(DIAGNOSTICS_DIR, trace_memory=trace_memory, cprofile=cprofile) if profile else None
+    stage = diagnostics.stage if diagnostics else (lambda name: nullcontext())
+    if diagnostics:
+        logger.info(f"🔬 Profiling enabled, writing diagnostics to {DIAGNOSTICS_DIR}/")
+        diagnostics.start()
+    
     try:
         # Fetch leaderboard
-        players = fetch_leaderboard()
+        with stage("fetch_leaderboard"):
+            players = fetch_leaderboard()
         
         all_builds = []
+        games_by_player = {}
         
         # Fetch builds for each player
         for player in players:
             logger.info(f"📊 Processing {player.username} (Rank {player.rank})...")
             
             # Search for matches
-            matches = search_player_matches(player.username)
+            with stage("search_matches"):
+                matches = search_player_matches(player.username)
             
             if matches:
+                games_by_player[player.username] = matches
                 # Extract builds from matches
-                builds = extract_builds_from_matches(matches, player.username, player.rank)
+                with stage("extract_builds"):
+                    builds = extract_builds_from_matches(matches, player.username, player.rank, diagnostics)
                 all_builds.extend(builds)
                 logger.info(f"✅ Extracted {len(builds)} winning builds for {player.username}")
             else:
@@ -327,6 +372,32 @@ def main():
             logger.warning(f"⚠️ Could not copy to public directory: {e}")
         
         logger.info(f"✅ Data saved to {output_file}")
+        
+        # Feed this run's builds into the rolling meta trend tracker; a run with no new
+        # builds (e.g. API outage or a same-day rerun) leaves the state untouched
+        try:
+            tracker = MetaTrendTracker.load(TRENDS_STATE_FILE)
+            for build in all_builds:
+                tracker.add_build(build)
+            trends = tracker.finish_run(top_k=10)
+            if trends["new_builds"]:
+                trends["timestamp"] = output_data["timestamp"]
+                tracker.save(TRENDS_STATE_FILE)
+                with open(TRENDS_OUTPUT_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(trends, f, indent=2, ensure_ascii=False)
+                logger.info(f"📈 Meta trends updated from {trends['new_builds']} new builds ({TRENDS_OUTPUT_FILE})")
+            else:
+                logger.warning("⚠️ No new builds this run, leaving meta trends untouched")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update meta trends: {e}")
+        
+        # Columnar export for analysis over accumulated history
+        try:
+            counts = export_columnar(all_builds, games_by_player, EXPORT_DIR)
+            logger.info(f"🗄️ Parquet export to {EXPORT_DIR}/: " + ", ".join(f"{n} {name}" for name, n in counts.items()))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write Parquet export: {e}")
+        
         logger.info(f"📊 Total builds: {len(all_builds)}")
         logger.info(f"👥 Players processed: {len(players)}")
         
@@ -338,6 +409,22 @@ def main():
     except Exception as e:
         logger.error(f"❌ Error in main execution: {e}")
         raise
+    finally:
+        if diagnostics:
+            summary = diagnostics.finish()
+            logger.info(f"🔬 Diagnostics: {summary['games']} games, outcomes {summary['outcomes']}")
+            if summary["quarantined"]:
+                logger.warning(f"⚠️ {summary['quarantined']} games quarantined in {diagnostics.quarantine_path}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Fetch top players' winning Illuvium builds")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"time fetch/extraction and write per-game diagnostics to {DIAGNOSTICS_DIR}/")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="also run cProfile (implies --profile; slows every call)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also record per-game allocations with tracemalloc (implies --profile; slows allocation)")
+    args = parser.parse_args()
+    main(profile=args.profile, cprofile=args.cprofile, trace_memory=args.tracemalloc) 
\ No newline at end of file
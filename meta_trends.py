@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Illuvium Meta Trend Tracker
+Incrementally tracks which illuvials, augments, suits and weapons are rising or
+falling across fetch runs, without keeping the full build history around
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+CATEGORIES = ("illuvial", "augment", "suit", "weapon")
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount a key"""
+
+    def __init__(self, width: int = 512, depth: int = 4, table: Optional[List[List[float]]] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else [[0.0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> Iterable[Tuple[int, int]]:
+        # Double hashing off a single stable digest (builtin hash() is salted per process)
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for row in range(self.depth):
+            yield row, (h1 + row * h2) % self.width
+
+    def add(self, key: str, count: float = 1.0):
+        for row, col in self._indexes(key):
+            self.table[row][col] += count
+
+    def estimate(self, key: str) -> float:
+        return min(self.table[row][col] for row, col in self._indexes(key))
+
+    def scale(self, factor: float):
+        """Multiply every cell, used to apply exponential decay in place"""
+        for row in self.table:
+            for col in range(self.width):
+                row[col] *= factor
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"width": self.width, "depth": self.depth, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMinSketch":
+        return cls(width=data["width"], depth=data["depth"], table=data["table"])
+
+class CategoryTrend:
+    """Decayed and sliding-window counters for one category (e.g. augments)"""
+
+    def __init__(self, window_runs: int, capacity: int, sketch_width: int, sketch_depth: int):
+        self.window_runs = window_runs
+        self.capacity = capacity
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.decayed = CountMinSketch(sketch_width, sketch_depth)
+        self.decayed_total = 0.0
+        # One sketch per run, oldest first; the last entry is the current run
+        self.window: Deque[CountMinSketch] = deque(maxlen=window_runs)
+        self.window_totals: Deque[float] = deque(maxlen=window_runs)
+        # Bounded candidate set of keys worth reporting on (the long tail is only in the sketches)
+        self.candidates: Dict[str, float] = {}
+
+    def start_run(self, decay: float):
+        self.decayed.scale(decay)
+        self.decayed_total *= decay
+        for key in self.candidates:
+            self.candidates[key] *= decay
+        self.window.append(CountMinSketch(self.sketch_width, self.sketch_depth))
+        self.window_totals.append(0.0)
+
+    def add(self, key: str, count: float = 1.0):
+        self.decayed.add(key, count)
+        self.decayed_total += count
+        self.window[-1].add(key, count)
+        self.window_totals[-1] += count
+
+        score = self.decayed.estimate(key)
+        if key in self.candidates or len(self.candidates) < self.capacity:
+            self.candidates[key] = score
+            return
+        weakest = min(self.candidates, key=self.candidates.get)
+        if score > self.candidates[weakest]:
+            del self.candidates[weakest]
+            self.candidates[key] = score
+
+    def window_count(self, key: str) -> float:
+        return sum(sketch.estimate(key) for sketch in self.window)
+
+    def baseline(self, decay: float) -> Tuple[CountMinSketch, float]:
+        """Decayed history with the window's own (decayed) contribution subtracted out"""
+        table = [list(row) for row in self.decayed.table]
+        total = self.decayed_total
+        weight = 1.0
+        # The newest bucket was added at full weight and has been decayed once per later run
+        for sketch, bucket_total in zip(reversed(self.window), reversed(self.window_totals)):
+            for row, bucket_row in zip(table, sketch.table):
+                for col, count in enumerate(bucket_row):
+                    if count:
+                        row[col] -= weight * count
+            total -= weight * bucket_total
+            weight *= decay
+        return CountMinSketch(self.decayed.width, self.decayed.depth, table), total
+
+    def movers(self, top_k: int, decay: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Rank candidates by recent-window share minus their share of the older baseline"""
+        window_total = sum(self.window_totals)
+        baseline, baseline_total = self.baseline(decay)
+        # Until history extends past the window there is nothing to compare against
+        if window_total <= 0 or baseline_total <= 1e-9:
+            return {"risers": [], "fallers": []}
+
+        rows = []
+        for key in self.candidates:
+            window_count = self.window_count(key)
+            baseline_score = max(baseline.estimate(key), 0.0)
+            momentum = window_count / window_total - baseline_score / baseline_total
+            rows.append({
+                "name": key,
+                "window_count": round(window_count, 3),
+                "baseline_score": round(baseline_score, 3),
+                "momentum": round(momentum, 5)
+            })
+
+        rows.sort(key=lambda r: r["momentum"], reverse=True)
+        risers = [r for r in rows if r["momentum"] > 0][:top_k]
+        fallers = [r for r in reversed(rows) if r["momentum"] < 0][:top_k]
+        return {"risers": risers, "fallers": fallers}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "decayed": self.decayed.to_dict(),
+            "decayed_total": self.decayed_total,
+            "window": [sketch.to_dict() for sketch in self.window],
+            "window_totals": list(self.window_totals),
+            "candidates": self.candidates
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        self.decayed = CountMinSketch.from_dict(data["decayed"])
+        # New run buckets must match the persisted sketch shape
+        self.sketch_width = self.decayed.width
+        self.sketch_depth = self.decayed.depth
+        self.decayed_total = data.get("decayed_total", 0.0)
+        self.window = deque((CountMinSketch.from_dict(s) for s in data.get("window", [])), maxlen=self.window_runs)
+        self.window_totals = deque(data.get("window_totals", []), maxlen=self.window_runs)
+        candidates = data.get("candidates", {})
+        # Respect a capacity that may have shrunk since the state was written
+        strongest = sorted(candidates.items(), key=lambda kv: kv[1], reverse=True)[:self.capacity]
+        self.candidates = dict(strongest)
+
+class MetaTrendTracker:
+    """Streaming aggregator fed one WinningBuild at a time, persisted between runs"""
+
+    def __init__(self, half_life_runs: float = 7.0, window_runs: int = 7, capacity: int = 200,
+                 sketch_width: int = 512, sketch_depth: int = 4, seen_limit: int = 5000):
+        self.half_life_runs = half_life_runs
+        self.window_runs = window_runs
+        self.seen_limit = seen_limit
+        self.run_count = 0
+        self.categories = {
+            name: CategoryTrend(window_runs, capacity, sketch_width, sketch_depth)
+            for name in CATEGORIES
+        }
+        # Games already counted; the fetch window overlaps between daily runs
+        self.seen_games: "OrderedDict[str, int]" = OrderedDict()
+        self._in_run = False
+        self.new_builds = 0
+
+    @property
+    def decay(self) -> float:
+        return 0.5 ** (1.0 / self.half_life_runs)
+
+    def start_run(self):
+        for category in self.categories.values():
+            category.start_run(self.decay)
+        self.run_count += 1
+        self._in_run = True
+
+    def add_build(self, build) -> bool:
+        """Count a build once; returns False if its game was already seen"""
+        seen_key = f"{build.player_name}:{build.game_id}" if build.game_id else None
+        if seen_key and seen_key in self.seen_games:
+            return False
+
+        # The run only starts on its first new build, so a rerun over already-seen
+        # games neither decays the history nor pushes an empty bucket into the window
+        if not self._in_run:
+            self.start_run()
+        self.new_builds += 1
+
+        if seen_key:
+            self.seen_games[seen_key] = self.run_count
+            while len(self.seen_games) > self.seen_limit:
+                self.seen_games.popitem(last=False)
+
+        for illuvial in build.illuvials:
+            self.categories["illuvial"].add(illuvial.name)
+            for augment in illuvial.augments or []:
+                self.categories["augment"].add(augment)
+        if build.suit:
+            self.categories["suit"].add(build.suit)
+        if build.weapon:
+            self.categories["weapon"].add(build.weapon)
+        return True
+
+    def finish_run(self, top_k: int = 10) -> Dict[str, Any]:
+        """Close the current run and report top-k risers and fallers per category"""
+        new_builds = self.new_builds
+        self._in_run = False
+        self.new_builds = 0
+        return {
+            "run": self.run_count,
+            "new_builds": new_builds,
+            "half_life_runs": self.half_life_runs,
+            "window_runs": self.window_runs,
+            "trends": {name: category.movers(top_k, self.decay) for name, category in self.categories.items()}
+        }
+
+    def save(self, path: str):
+        state = {
+            "half_life_runs": self.half_life_runs,
+            "window_runs": self.window_runs,
+            "run_count": self.run_count,
+            "seen_games": list(self.seen_games.items()),
+            "categories": {name: category.to_dict() for name, category in self.categories.items()}
+        }
+        # Write then rename so a crash mid-write can't leave a truncated state file behind
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "MetaTrendTracker":
+        """Restore tracker state from a previous run, or start fresh if none exists"""
+        tracker = cls(**kwargs)
+        if not os.path.exists(path):
+            return tracker
+
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        tracker.run_count = state.get("run_count", 0)
+        tracker.seen_games = OrderedDict((key, run) for key, run in state.get("seen_games", []))
+        for name, data in state.get("categories", {}).items():
+            if name in tracker.categories:
+                tracker.categories[name].load_dict(data)
+        return tracker
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def make_build():
+    """Factory for WinningBuild-shaped objects, without importing the fetcher (which needs a .env)"""
+    def factory(game_id, names=("A", "B"), player_name="p", suit="S", weapon="W",
+                match_date="2026-10-12 03:00 UTC", mode="Ranked", augments=()):
+        return SimpleNamespace(
+            game_id=game_id,
+            player_name=player_name,
+            player_rank=1,
+            placement=1,
+            suit=suit,
+            weapon=weapon,
+            match_date=match_date,
+            mode=mode,
+            illuvials=[SimpleNamespace(name=name, is_bonded=False, augments=list(augments)) for name in names],
+        )
+    return factory
@@ -0,0 +1,56 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from columnar_export import export_columnar
+
+
+def make_game(game_id, start_time):
+    side = {"player": "p", "suit": "S", "weapon": "W", "illuvials": [{"name": "A"}, {"name": "B"}]}
+    return {
+        "gameId": game_id,
+        "mode": "Ranked",
+        "startTime": start_time,
+        "rounds": [{"matchups": [{"blue": side, "red": {"player": "q"}}]}],
+    }
+
+
+def export_run(make_build, output_dir, games):
+    builds = [
+        make_build(game_id, match_date=start.replace("T", " ")[:16] + " UTC", augments=["x"])
+        for game_id, start in games
+    ]
+    raw = [make_game(game_id, start) for game_id, start in games]
+    export_columnar(builds, {"p": raw}, str(output_dir))
+
+
+def game_ids(output_dir, name):
+    table = ds.dataset(str(output_dir / name), partitioning="hive").to_table()
+    return sorted(table.column("game_id").to_pylist())
+
+
+def test_overlapping_runs_keep_every_game_once(tmp_path, make_build):
+    # Run 2's window starts mid-day, so it only sees part of 2026-10-12
+    export_run(make_build, tmp_path, [("g1", "2026-10-12T03:00:00Z"), ("g2", "2026-10-12T15:00:00Z")])
+    export_run(make_build, tmp_path, [("g2", "2026-10-12T15:00:00Z"), ("g3", "2026-10-13T09:00:00Z")])
+
+    assert game_ids(tmp_path, "builds") == ["g1", "g2", "g3"]
+    assert game_ids(tmp_path, "rounds") == ["g1", "g2", "g3"]
+    assert game_ids(tmp_path, "illuvials") == ["g1", "g1", "g2", "g2", "g3", "g3"]
+
+
+def test_partitions_and_dictionary_columns(tmp_path, make_build):
+    export_run(make_build, tmp_path, [("g1", "2026-10-12T03:00:00Z")])
+
+    dataset = ds.dataset(str(tmp_path / "builds"), partitioning="hive")
+    table = dataset.to_table(filter=(ds.field("mode") == "Ranked") & (ds.field("date") == "2026-10-12"))
+    assert table.num_rows == 1
+    assert pa.types.is_dictionary(table.schema.field("suit").type)
+
+
+def test_games_without_id_are_never_merged_away(tmp_path, make_build):
+    export_run(make_build, tmp_path, [("", "2026-10-12T03:00:00Z"), ("g1", "2026-10-12T04:00:00Z")])
+    export_run(make_build, tmp_path, [("", "2026-10-12T05:00:00Z"), ("g1", "2026-10-12T04:00:00Z")])
+
+    assert game_ids(tmp_path, "builds") == ["", "", "g1"]
@@ -0,0 +1,44 @@
+import json
+
+from fetch_diagnostics import RunDiagnostics
+
+
+def test_peak_bytes_exclude_payload_serialization(tmp_path):
+    game = {"gameId": "big", "blob": "x" * 5_000_000}
+    diagnostics = RunDiagnostics(str(tmp_path), trace_memory=True)
+    diagnostics.start()
+    diagnostics.begin_game()
+    diagnostics.end_game(game, "p", "not_a_win")
+    summary = diagnostics.finish()
+
+    record = summary["most_allocating_games"][0]
+    assert record["payload_bytes"] > 5_000_000
+    assert record["peak_bytes"] < 100_000
+    assert summary["timings_include_profiler_overhead"]
+
+
+def test_abnormal_outcomes_are_quarantined(tmp_path):
+    diagnostics = RunDiagnostics(str(tmp_path))
+    diagnostics.start()
+    for game_id, outcome in [("g1", "build"), ("g2", "not_a_win"), ("g3", "empty_team")]:
+        diagnostics.begin_game()
+        diagnostics.end_game({"gameId": game_id}, "p", outcome)
+    summary = diagnostics.finish()
+
+    lines = (tmp_path / "quarantine.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["reason"] for line in lines] == ["empty_team"]
+    assert summary["quarantined"] == 1
+    assert not summary["timings_include_profiler_overhead"]
+
+
+def test_stage_timings_exclude_payload_sizing(tmp_path):
+    game = {"gameId": "big", "blob": ["x" * 100] * 200_000}
+    diagnostics = RunDiagnostics(str(tmp_path))
+    diagnostics.start()
+    with diagnostics.stage("extract_builds"):
+        diagnostics.begin_game()
+        diagnostics.end_game(game, "p", "build")
+    summary = diagnostics.finish()
+
+    assert summary["diagnostics_overhead_seconds"] > 0
+    assert summary["stage_seconds"]["extract_builds"] < summary["diagnostics_overhead_seconds"]
@@ -0,0 +1,59 @@
+from meta_trends import MetaTrendTracker
+
+
+def run(make_build, tracker, run_index, names, builds=10):
+    for i in range(builds):
+        tracker.add_build(make_build(f"{run_index}-{i}", names))
+    return tracker.finish_run(top_k=5)["trends"]["illuvial"]
+
+
+def test_young_tracker_reports_new_pick_as_riser(make_build):
+    tracker = MetaTrendTracker()
+    for r in range(5):
+        run(make_build, tracker, r, ["A", "B"])
+    for r in range(5, 8):
+        trends = run(make_build, tracker, r, ["A", "C"])
+
+    assert trends["risers"][0]["name"] == "C"
+    assert trends["fallers"][0]["name"] == "B"
+    assert "B" not in [row["name"] for row in trends["risers"]]
+
+
+def test_no_trends_until_history_extends_past_window(make_build):
+    tracker = MetaTrendTracker(window_runs=3)
+    for r in range(3):
+        trends = run(make_build, tracker, r, ["A"] if r < 2 else ["B"])
+    assert trends == {"risers": [], "fallers": []}
+
+
+def test_save_is_atomic_and_round_trips(tmp_path, make_build):
+    path = tmp_path / "state.json"
+    tracker = MetaTrendTracker()
+    run(make_build, tracker, 0, ["A"])
+    tracker.save(str(path))
+
+    assert not (tmp_path / "state.json.tmp").exists()
+    restored = MetaTrendTracker.load(str(path))
+    assert restored.run_count == 1
+    assert not restored.add_build(make_build("0-0", ["A"]))
+
+
+def test_rerun_of_seen_games_leaves_window_and_movers_alone(make_build):
+    tracker = MetaTrendTracker(window_runs=3)
+    for r in range(3):
+        run(make_build, tracker, r, ["A"])
+    for r in range(3, 5):
+        before = run(make_build, tracker, r, ["A", "B"])
+    totals = list(tracker.categories["illuvial"].window_totals)
+
+    for _ in range(3):
+        for i in range(10):
+            assert not tracker.add_build(make_build(f"4-{i}", ["A", "B"]))
+        report = tracker.finish_run(top_k=5)
+
+    assert report["new_builds"] == 0
+    assert report["run"] == 5
+    assert list(tracker.categories["illuvial"].window_totals) == totals
+    assert report["trends"]["illuvial"] == before
+    assert before["risers"][0]["name"] == "B"
+    assert before["fallers"][0]["name"] == "A"